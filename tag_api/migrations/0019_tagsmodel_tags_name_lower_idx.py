@@ -0,0 +1,18 @@
+# Generated by Django 4.1.5 on 2026-10-15 10:00
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tag_api', '0018_alter_tagsmodel_tag_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tagsmodel',
+            index=models.Index(django.db.models.functions.text.Lower('tag_name'), name='tags_name_lower_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import IntegrityError, models
+from django.db.models.functions import Lower
 from django.core.exceptions import ValidationError
 import uuid
 from django.http import JsonResponse
@@ -41,6 +42,9 @@ class TagsModel(models.Model):
     class Meta:
         managed = True
         unique_together = ('tag_name', 'scope')
+        indexes = [
+            models.Index(Lower('tag_name'), name='tags_name_lower_idx'),
+        ]
         db_table = 'tags'
         verbose_name = 'tags'
 
@@ -56,8 +60,11 @@ class TagsModel(models.Model):
         # self.tag_name = None if self.tag_name == '' else self.tag_name
         self.scope = None if self.scope == '' else self.scope
 
-        if TagsModel.objects.filter(tag_name=self.tag_name, scope=self.scope).exists():
-            raise ValidationError("This tag already exists.")
+        # The unique (tag_name, scope) constraint is enforced by the database;
+        # only NULL scopes need checking here since NULLs never compare equal.
+        # Raise the same error the constraint would so callers handle both alike.
+        if self.scope is None and TagsModel.objects.filter(tag_name=self.tag_name, scope__isnull=True).exists():
+            raise IntegrityError("This tag already exists.")
         
         super().save(*args, **kwargs)
 
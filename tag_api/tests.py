@@ -1,3 +1,262 @@
-from django.test import TestCase
+import json
+import uuid
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from .models import TagsModel, VM, UserProfile
+from .views import _upsert_and_link_tags, link_vm_tags
+
+
+class LinkVMTagsTests(TestCase):
+    """
+    Tests for linking tag-scope pairs to a VM.
+    """
+
+    def setUp(self):
+        self.user = UserProfile.objects.create(user_name='admin')
+        self.vm = VM.objects.create(vm_name='vm1')
+
+    def vm_tags(self):
+        return sorted(self.vm.tags.values_list('tag_name', 'scope'), key=str)
+
+    def test_creates_new_tags(self):
+        link_vm_tags(self.vm.vm_id, [('env', 'prod'), ('team', 'ops')], self.user.user_id)
+
+        self.assertEqual(self.vm_tags(), [('env', 'prod'), ('team', 'ops')])
+        self.assertEqual(TagsModel.objects.filter(user_id=self.user).count(), 2)
+
+    def test_reuses_existing_tags(self):
+        other = UserProfile.objects.create(user_name='other')
+        existing = TagsModel.objects.create(tag_name='env', scope='prod', user_id=other)
+
+        link_vm_tags(self.vm.vm_id, [('env', 'prod'), ('team', 'ops')], self.user.user_id)
+
+        self.assertEqual(TagsModel.objects.count(), 2)
+        self.assertIn(existing, self.vm.tags.all())
+        self.assertEqual(TagsModel.objects.get(tag_name='env').user_id, other)
+
+    def test_duplicate_pairs_are_linked_once(self):
+        link_vm_tags(self.vm.vm_id, [('env', 'prod'), ('env', 'prod')], self.user.user_id)
+        link_vm_tags(self.vm.vm_id, [('env', 'prod')], self.user.user_id)
+
+        self.assertEqual(TagsModel.objects.count(), 1)
+        self.assertEqual(VM.tags.through.objects.filter(vm=self.vm).count(), 1)
+
+    def test_null_scope_reuses_existing_tag(self):
+        TagsModel.objects.create(tag_name='env', scope=None, user_id=self.user)
+
+        link_vm_tags(self.vm.vm_id, [('env', None)], self.user.user_id)
+
+        self.assertEqual(TagsModel.objects.filter(tag_name='env', scope__isnull=True).count(), 1)
+        self.assertEqual(self.vm_tags(), [('env', None)])
+
+    def test_tags_that_were_not_created_raise(self):
+        with mock.patch.object(TagsModel.objects, 'bulk_create'):
+            with self.assertRaises(ValidationError):
+                link_vm_tags(self.vm.vm_id, [('env', 'prod')], self.user.user_id)
+
+        self.assertEqual(self.vm_tags(), [])
+
+    @skipUnless(connection.vendor == 'postgresql', 'ON CONFLICT upsert is PostgreSQL-only')
+    def test_upsert_creates_and_links_tags(self):
+        existing = TagsModel.objects.create(tag_name='env', scope='prod', user_id=self.user)
+
+        _upsert_and_link_tags(self.vm.vm_id, [('env', 'prod'), ('team', 'ops')], self.user.user_id)
+        _upsert_and_link_tags(self.vm.vm_id, [('team', 'ops')], self.user.user_id)
+
+        self.assertEqual(TagsModel.objects.count(), 2)
+        self.assertEqual(TagsModel.objects.get(tag_name='env').tag_id, existing.tag_id)
+        self.assertEqual(self.vm_tags(), [('env', 'prod'), ('team', 'ops')])
+        self.assertEqual(VM.tags.through.objects.filter(vm=self.vm).count(), 2)
+
+
+class VMsPostTests(TestCase):
+    """
+    Tests for creating VMs with tags through the API.
+    """
+
+    def post(self, data):
+        return self.client.post('/vms', json.dumps(data), content_type='application/json').json()
+
+    def test_creates_vm_with_tags(self):
+        user = UserProfile.objects.create(user_name='admin')
+
+        response = self.post({'vm_name': 'vm1', 'tags': ['env:prod', 'env:prod'], 'user_id': user.user_id})
+
+        self.assertEqual(response['error_code'], 0)
+        self.assertEqual(list(VM.objects.get(vm_name='vm1').tags.values_list('tag_name', 'scope')), [('env', 'prod')])
+
+    def test_missing_user_id_is_rejected(self):
+        response = self.post({'vm_name': 'vm1', 'tags': ['env:prod']})
+
+        self.assertEqual(response['error_code'], 400)
+        self.assertFalse(VM.objects.exists())
+        self.assertFalse(TagsModel.objects.exists())
+
+    def test_non_numeric_user_id_is_rejected(self):
+        response = self.post({'vm_name': 'vm1', 'tags': ['env:prod'], 'user_id': 'abc'})
+
+        self.assertEqual((response['error_code'], response['message']), (400, 'Invalid user id'))
+        self.assertFalse(VM.objects.exists())
+
+    def test_unknown_user_is_rejected(self):
+        response = self.post({'vm_name': 'vm1', 'tags': ['env:prod'], 'user_id': 999})
+
+        self.assertEqual(response['error_code'], 100)
+        self.assertFalse(VM.objects.exists())
+        self.assertFalse(TagsModel.objects.exists())
+
+    def test_vm_name_is_read_from_the_form(self):
+        self.post({'vm_name': ' vm1 '})
+
+        self.assertTrue(VM.objects.filter(vm_name='vm1').exists())
+
+    def test_too_long_tag_is_rejected(self):
+        user = UserProfile.objects.create(user_name='admin')
+
+        response = self.post({'vm_name': 'vm1', 'tags': ['x' * 256 + ':prod'], 'user_id': user.user_id})
+
+        self.assertEqual(response['error_code'], 103)
+        self.assertFalse(VM.objects.exists())
+        self.assertFalse(TagsModel.objects.exists())
+
+    def test_duplicate_vm_name_is_rejected(self):
+        VM.objects.create(vm_name='vm1')
+
+        response = self.post({'vm_name': 'vm1'})
+
+        self.assertEqual(response['error_code'], 102)
+        self.assertEqual(VM.objects.count(), 1)
+
+
+class TagsPostTests(TransactionTestCase):
+    """
+    Tests for creating tags through the API.
+
+    Duplicate inserts fail in the database, so these run outside a wrapping transaction.
+    """
+
+    def setUp(self):
+        self.user = UserProfile.objects.create(user_name='admin')
+
+    def post(self, data):
+        return self.client.post('/tags', json.dumps(data), content_type='application/json').json()
+
+    def test_values_are_read_from_the_form(self):
+        self.post({'tag_name': ' env ', 'scope': ' prod ', 'user_id': self.user.user_id})
+
+        self.assertEqual(list(TagsModel.objects.values_list('tag_name', 'scope')), [('env', 'prod')])
+
+    def test_missing_user_id_is_rejected(self):
+        response = self.post({'tag_name': 'env'})
+
+        self.assertEqual((response['error_code'], response['message']), (400, 'User id is required'))
+
+    def test_non_numeric_user_id_is_rejected(self):
+        response = self.post({'tag_name': 'env', 'user_id': 'abc'})
+
+        self.assertEqual((response['error_code'], response['message']), (400, 'Invalid user id'))
+        self.assertFalse(TagsModel.objects.exists())
+
+    def test_duplicate_tag_is_rejected(self):
+        data = {'tag_name': 'env', 'scope': 'prod', 'user_id': self.user.user_id}
+        self.post(data)
+
+        response = self.post(data)
+
+        self.assertEqual(response['error_code'], 102)
+        self.assertEqual(TagsModel.objects.count(), 1)
+
+    def test_duplicate_tag_without_scope_is_rejected(self):
+        data = {'tag_name': 'env', 'user_id': self.user.user_id}
+        self.post(data)
+
+        response = self.post(data)
+
+        self.assertEqual(response['error_code'], 102)
+        self.assertEqual(TagsModel.objects.count(), 1)
+
+
+class VMsGetTests(TestCase):
+    """
+    Tests for listing VMs through the API.
+    """
+
+    def setUp(self):
+        user = UserProfile.objects.create(user_name='admin')
+        self.prod = VM.objects.create(vm_name='prod-only')
+        self.both = VM.objects.create(vm_name='prod-and-ops')
+        link_vm_tags(self.prod.vm_id, [('env', 'prod')], user.user_id)
+        link_vm_tags(self.both.vm_id, [('env', 'prod'), ('team', 'ops')], user.user_id)
+
+    def vm_names(self, query):
+        return sorted(vm['vm_name'] for vm in self.client.get('/vms' + query).json()['data'])
+
+    def test_scopes_must_all_match(self):
+        self.assertEqual(self.vm_names('?scopes=prod&scopes=ops'), ['prod-and-ops'])
+
+    def test_single_scope(self):
+        self.assertEqual(self.vm_names('?scopes=prod'), ['prod-and-ops', 'prod-only'])
+
+    def test_filtered_vm_lists_all_its_tags(self):
+        data = self.client.get('/vms?scopes=ops').json()['data']
+
+        self.assertEqual(len(data), 1)
+        self.assertEqual(len(data[0]['tags']), 2)
+
+
+class TagsDeleteTests(TestCase):
+    """
+    Tests for deleting tags through the API.
+    """
+
+    def setUp(self):
+        # user_id 1 is the admin; ids are explicit since sequences are not reset between tests
+        self.admin = UserProfile.objects.create(user_id=1, user_name='admin')
+        self.owner = UserProfile.objects.create(user_id=2, user_name='owner')
+        self.other = UserProfile.objects.create(user_id=3, user_name='other')
+        self.tag = TagsModel.objects.create(tag_name='env', scope='prod', user_id=self.owner)
+
+    def delete(self, tag_id, user_id):
+        return self.client.delete('/tags?tag_id={0}&user_id={1}'.format(tag_id, user_id)).json()
+
+    def test_owner_deletes_tag(self):
+        response = self.delete(self.tag.tag_id, self.owner.user_id)
+
+        self.assertEqual(response['error_code'], 0)
+        self.assertFalse(TagsModel.objects.exists())
+
+    def test_admin_deletes_any_tag(self):
+        response = self.delete(self.tag.tag_id, self.admin.user_id)
+
+        self.assertEqual(response['error_code'], 0)
+        self.assertFalse(TagsModel.objects.exists())
+
+    def test_non_owner_is_rejected(self):
+        response = self.delete(self.tag.tag_id, self.other.user_id)
+
+        self.assertEqual((response['error_code'], response['message']), (100, 'Invalid Request.'))
+        self.assertTrue(TagsModel.objects.exists())
+
+    def test_assigned_tag_is_rejected(self):
+        VM.objects.create(vm_name='vm1').tags.add(self.tag)
+
+        response = self.delete(self.tag.tag_id, self.owner.user_id)
+
+        self.assertEqual(response['error_code'], 101)
+        self.assertTrue(TagsModel.objects.exists())
+
+    def test_admin_deleting_missing_tag_succeeds(self):
+        response = self.delete(uuid.uuid4(), self.admin.user_id)
+
+        self.assertEqual(response['error_code'], 0)
+        self.assertTrue(TagsModel.objects.exists())
+
+    def test_non_numeric_user_id_is_rejected(self):
+        response = self.delete(self.tag.tag_id, 'abc')
+
+        self.assertEqual(response['error_code'], 400)
+        self.assertTrue(TagsModel.objects.exists())
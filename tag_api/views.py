@@ -1,18 +1,151 @@
 from collections import Counter
 from django.shortcuts import get_object_or_404, render
-from django.http import JsonResponse
+from django.core.paginator import Paginator
+from django.http import Http404
 from django import forms
 from django.core.exceptions import ValidationError
 from django.views.decorators.csrf import csrf_exempt
-from django.db import IntegrityError
+from django.db import IntegrityError, connection, transaction
 from rest_framework.views import APIView
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.functions import Lower
 from django.utils.translation import gettext as _
 
 from .models import TagsModel, VM, UserProfile
 from .forms import tags_form, VMForm
+from .responses import OrjsonResponse
+
+import uuid
+from functools import reduce
+from itertools import groupby
+from operator import itemgetter, or_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def parse_user_id(user_id):
+    """
+    Convert a request user_id to an int.
+
+    Returns (user_id, None) on success, or (None, error response) when the
+    user_id is missing or not numeric.
+    """
+    if user_id is None or user_id == 'None' or user_id == '':
+        return None, OrjsonResponse({'status': 'error', 'error_code': 400, 'message': _("User id is required")})
+
+    try:
+        return int(user_id), None
+    except (TypeError, ValueError):
+        return None, OrjsonResponse({'status': 'error', 'error_code': 400, 'message': _("Invalid user id")})
+
+
+def paginate_queryset(request, queryset):
+    """
+    Return one page of rows from a values() queryset along with its pagination details.
+
+    The page is selected with ?page= and its size with ?page_size= (DEFAULT_PAGE_SIZE
+    when omitted, capped at MAX_PAGE_SIZE), so a single request never loads the whole table.
+    """
+    try:
+        page_size = min(max(int(request.GET.get('page_size', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        page_size = DEFAULT_PAGE_SIZE
+
+    if not queryset.ordered:
+        queryset = queryset.order_by('pk')
+
+    page = Paginator(queryset, page_size).get_page(request.GET.get('page'))
+    pagination = {
+        'page': page.number,
+        'page_size': page_size,
+        'total_pages': page.paginator.num_pages,
+        'total_count': page.paginator.count,
+        'has_next': page.has_next(),
+    }
+    return list(page), pagination
+
+
+def _upsert_and_link_tags(vm_id, pairs, user_id):
+    """
+    Create missing tags and link all of them to a VM in one PostgreSQL statement.
+
+    The tags are upserted with ON CONFLICT on (tag_name, scope) so RETURNING
+    yields the ids of new and existing tags alike, and the through rows are
+    inserted from that result set.
+    """
+    quote = connection.ops.quote_name
+    tag_opts = TagsModel._meta
+    through = VM.tags.through._meta
+    tag_id, tag_name, scope, owner = (quote(tag_opts.get_field(name).column) for name in ('tag_id', 'tag_name', 'scope', 'user_id'))
+
+    params = []
+    for name, tag_scope in pairs:
+        params.extend([uuid.uuid4(), name, tag_scope, user_id])
+    params.append(vm_id)
+
+    sql = (
+        "WITH ins AS ("
+        "INSERT INTO {tags} ({tag_id}, {tag_name}, {scope}, {owner}) VALUES {values} "
+        "ON CONFLICT ({tag_name}, {scope}) DO UPDATE SET {tag_name} = EXCLUDED.{tag_name} "
+        "RETURNING {tag_id}"
+        ") "
+        "INSERT INTO {through} ({vm_column}, {tag_column}) SELECT %s, {tag_id} FROM ins "
+        "ON CONFLICT DO NOTHING"
+    ).format(
+        tags=quote(tag_opts.db_table),
+        tag_id=tag_id,
+        tag_name=tag_name,
+        scope=scope,
+        owner=owner,
+        values=', '.join(['(%s, %s, %s, %s)'] * len(pairs)),
+        through=quote(through.db_table),
+        vm_column=quote(through.get_field('vm').column),
+        tag_column=quote(through.get_field('tagsmodel').column),
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def link_vm_tags(vm_id, pairs, user_id):
+    """
+    Link (tag_name, scope) pairs to a VM, creating the tags that do not exist yet.
+
+    On PostgreSQL this is a single INSERT ... ON CONFLICT ... RETURNING statement.
+    Other backends, and pairs without a scope (NULLs never conflict in a unique
+    index), use one lookup query plus bulk inserts.
+    """
+    pairs = list(dict.fromkeys(pairs))
+
+    if connection.vendor == 'postgresql' and all(tag_scope is not None for name, tag_scope in pairs):
+        _upsert_and_link_tags(vm_id, pairs, user_id)
+        return
+
+    # Fetch the tags that already exist in a single query
+    pairs_query = reduce(or_, [Q(tag_name=name, scope=tag_scope) for name, tag_scope in pairs])
+    existing = {(tag.tag_name, tag.scope): tag for tag in TagsModel.objects.filter(pairs_query)}
+
+    # Create the missing tags in bulk and re-fetch them to get their ids
+    missing = [TagsModel(tag_name=name, scope=tag_scope, user_id_id=user_id)
+               for name, tag_scope in pairs if (name, tag_scope) not in existing]
+    if missing:
+        TagsModel.objects.bulk_create(missing, ignore_conflicts=True)
+        existing = {(tag.tag_name, tag.scope): tag for tag in TagsModel.objects.filter(pairs_query)}
+
+    # bulk_create(ignore_conflicts=True) skips rows it could not insert without raising
+    unresolved = [pair for pair in pairs if pair not in existing]
+    if unresolved:
+        raise ValidationError("Could not create tags: {0}".format(
+            ', '.join('{0}:{1}'.format(name, tag_scope or '') for name, tag_scope in unresolved)))
+
+    # Link all tags to the VM with a single insert into the through table
+    ThroughModel = VM.tags.through
+    ThroughModel.objects.bulk_create(
+        [ThroughModel(vm_id=vm_id, tagsmodel_id=tag.tag_id) for tag in existing.values()],
+        ignore_conflicts=True,
+    )
 
-import json
 
 class Tags(APIView):
     """
@@ -25,6 +158,14 @@ class Tags(APIView):
 
     """
 
+    # Query parameters accepted by get, mapped to their ORM lookups
+    filter_lookups = {
+        'tag_id': 'tag_id',
+        'tag_name': 'tag_name__icontains',
+        'scope': 'scope__icontains',
+        'user_id': 'user_id_id',
+    }
+
     def get(self, request):
         """
         Retrieve tags based on specified filters.
@@ -36,54 +177,43 @@ class Tags(APIView):
         - tag_name (optional): Filter tags by tag_name.
         - scope (optional): Filter tags by scope.
         - user_id (optional): Filter tags by user_id.
+        - page, page_size (optional): Page of results to return (page_size defaults to 100).
+
+        Each tag in the response carries an is_assigned flag telling whether it is assigned to any VM.
 
         """
         try:
-            # Initialize filters for database queries
-            filters = Q()
-
-            # Check if tag_id is present in the request and add it to filters
-            if request.method == 'GET' and 'tag_id' in request.GET:
-                tag_id = request.GET['tag_id']
-                filters &= Q(tag_id=tag_id)
-
-            # Check if tag_name is present in the request and add it to filters
-            if request.method == 'GET' and 'tag_name' in request.GET:
-                tag_name = request.GET['tag_name']
-                filters &= Q(tag_name__regex=tag_name)
-
-            # Check if scope is present in the request and add it to filters
-            if request.method == 'GET' and 'scope' in request.GET:
-                scope = request.GET['scope']
-                filters &= Q(scope__regex=scope)
-
-            # Check if user_id is present in the request and add it to filters
-            if request.method == 'GET' and 'user_id' in request.GET:
-                user_id = request.GET['user_id']
-                filters &= Q(user_id=user_id)
+            # Map each supported query parameter to its ORM lookup
+            filters = {lookup: request.GET[param] for param, lookup in self.filter_lookups.items() if param in request.GET}
 
             # If no filters, get all tags data, else filter tags based on criteria
             if not filters:
-                tags_data = TagsModel.objects.all().values()
+                tags_data = TagsModel.objects.all()
             else:
-                tags_data = TagsModel.objects.filter(filters).values()
+                tags_data = TagsModel.objects.filter(**filters)
+
+            # Flag whether each tag is assigned to any VM within the same query
+            ThroughModel = VM.tags.through
+            tags_data = tags_data.annotate(
+                is_assigned=Exists(ThroughModel.objects.filter(tagsmodel_id=OuterRef('tag_id')))
+            ).values('tag_id', 'tag_name', 'scope', 'user_id_id', 'is_assigned')
 
-            # Convert queryset to list for JsonResponse
-            list_result = [entry for entry in tags_data]
+            # Fetch the requested page of tags
+            list_result, pagination = paginate_queryset(request, tags_data)
 
-            # Prepare and return JsonResponse
-            data = {'status': 'success', 'error_code': 0, 'message': _("Tags get successfully"), 'data': list_result}
-            return JsonResponse(data)
+            # Prepare and return OrjsonResponse
+            data = {'status': 'success', 'error_code': 0, 'message': _("Tags get successfully"), 'data': list_result, 'pagination': pagination}
+            return OrjsonResponse(data)
 
         except ValidationError as e:
             # Handle validation error
             data = {'status': 'error', 'error_code': 103, 'message': "error: {0} ".format(e)}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
         except NameError as e:
             # Handle name error
             data = {'status': 'error', 'error_code': 103, 'message': "error: {0} ".format(e)}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
 
     def post(self, request):
@@ -98,50 +228,56 @@ class Tags(APIView):
         
         """
         try:
-
-            # Parse the JSON data from the request
-            json_data = json.loads(request.body.decode('utf-8'))
-            
-            # Validate the form data
-            form = tags_form(request.POST)
+            # Validate the request data
+            form = tags_form(request.data)
 
             if form.is_valid():
-                # Get tag_name, scope, and user_id from the POST data
-                tag_name = request.data.get('tag_name')
-                scope = request.data.get('scope') or None
+                # Get tag_name and scope from the validated form, user_id from the POST data
+                tag_name = form.cleaned_data['tag_name']
+                scope = form.cleaned_data['scope'] or None
                 user_id = request.data.get("user_id")
 
-                # Get user profile associated with the provided user_id
-                user_profile = get_object_or_404(UserProfile, user_id=user_id)
+                user_id, error_response = parse_user_id(user_id)
+                if error_response:
+                    return error_response
 
-                # Create a new TagsModel instance
+                # Check that the user exists without loading the whole profile
+                if not UserProfile.objects.filter(pk=user_id).exists():
+                    data = {'status': 'error', 'error_code': 100, 'message': _("User not found")}
+                    return OrjsonResponse(data)
+
+                # Create a new TagsModel instance, assigning the user by id
                 tag = TagsModel()
                 tag.tag_name = tag_name
                 tag.scope = scope
-                tag.user_id = user_profile
+                tag.user_id_id = user_id
 
                 # Save the tag to the database
                 # tag_data = tag.save()
                 tag.save()
 
-                # Prepare and return JsonResponse
+                # Prepare and return OrjsonResponse
                 data = {'status': 'success', 'error_code': 0, 'message': _("Tag Added successfully"), 'data': ''}
-                return JsonResponse(data)
+                return OrjsonResponse(data)
+            else:
+                # Validation error in the form
+                data = {'status': 'error', 'error_code': 103, 'message': f"Validation Error: {form.errors}"}
+                return OrjsonResponse(data)
 
         except ValidationError as e:
             # Handle validation error
             data = {'status': 'error', 'error_code': 103, 'message': "error: {0} ".format(e)}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
         except NameError as e:
             # Handle name error
             data = {'status': 'error', 'error_code': 103, 'message': "error: {0} ".format(e)}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
         except IntegrityError:
             # Handle the case of a duplicate tag name
             data = {'status': 'error', 'error_code': 102, 'message': _("This Tag Already exist")}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
 
     def delete(self, request):
@@ -162,47 +298,60 @@ class Tags(APIView):
             # Check if tag_id is provided
             if tag_id == None or tag_id == 'None' or tag_id == '':
                 data = {'status': 'error', 'error_code': 100, 'message': _('Tag id is required')}
-                return JsonResponse(data)
-
-            # Check if user_id is provided
-            if user_id == None or user_id == 'None' or user_id == '':
-                data = {'status': 'error', 'error_code': 400, 'message': _("User id is required")}
-                return JsonResponse(data)
+                return OrjsonResponse(data)
+
+            # Check that user_id is provided and normalize it to an integer once
+            # so it matches the FK column type
+            user_id, error_response = parse_user_id(user_id)
+            if error_response:
+                return error_response
+
+            # Delete the tag if it is unassigned and the user is admin or the tag
+            # was created by the user; the filter carries all the checks
+            is_admin = user_id == 1
+            ThroughModel = VM.tags.through
+            tags_to_delete = TagsModel.objects.filter(
+                ~Exists(ThroughModel.objects.filter(tagsmodel_id=OuterRef('tag_id'))),
+                tag_id=tag_id,
+            )
+            if not is_admin:
+                tags_to_delete = tags_to_delete.filter(user_id_id=user_id)
+
+            deleted_count = tags_to_delete.delete()[0]
+
+            if deleted_count:
+                data = {'status': 'success', 'error_code': 0, 'message': _("Tag deleted successfully.")}
+                return OrjsonResponse(data)
 
-            # Check if the tag is assigned to any VMs
-            is_assigned = TagsModel.objects.filter(tag_id=tag_id, vms__isnull=False).exists()
+            # Nothing was deleted: report whether the tag is still assigned to VMs
+            is_assigned = ThroughModel.objects.filter(tagsmodel_id=tag_id).exists()
 
             if is_assigned:
                 data = {'status': 'error', 'error_code': 101,
                         'message': _("Tag is assigned to VMs. Unassign it before deleting.")}
-                return JsonResponse(data)
-
-            # Check if the user is admin or if the tag was created by the user
-            is_admin = user_id == '1'
-            is_exist = TagsModel.objects.filter(tag_id=tag_id, user_id__user_id=user_id).count()
-
-            if is_admin or is_exist > 0:
-                delete_tag = TagsModel.objects.filter(tag_id=tag_id).delete()
+                return OrjsonResponse(data)
+            elif is_admin:
+                # Admin delete of a tag that no longer exists has always reported success
                 data = {'status': 'success', 'error_code': 0, 'message': _("Tag deleted successfully.")}
-                return JsonResponse(data)
+                return OrjsonResponse(data)
             else:
                 data = {'status': 'error', 'error_code': 100, 'message': _("Invalid Request.")}
-                return JsonResponse(data)
+                return OrjsonResponse(data)
 
         except NameError as e:
             # Handle NameError
             data = {'status': 'error', 'error_code': 103, 'message': "error: {0} ".format(e)}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
         except KeyError as e:
             # Handle KeyError
             data = {'status': 'error', 'error_code': 102, 'message': "error: {0} is required".format(e)}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
         except Exception as e:
             # Handle other exceptions
             data = {'status': 'error', 'error_code': 101, 'message': "error: {0}".format(e)}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
 
 # =====================================================================================================  
@@ -228,43 +377,47 @@ class AssignUnassignTags(APIView):
                 tag_name = request.data.get('tag_name')
                 vm_ids = request.data.get('vm_ids', [])
 
-                # Get the tag instance
-                tag = get_object_or_404(TagsModel, tag_name=tag_name)
+                # Get the tag id without loading the whole tag
+                tag_id = get_object_or_404(TagsModel.objects.values_list('tag_id', flat=True), tag_name=tag_name)
 
-                # Add the tag to the specified VMs
-                tag.vms.add(*vm_ids)
+                # Add the tag to the specified VMs with a single insert
+                ThroughModel = VM.tags.through
+                ThroughModel.objects.bulk_create(
+                    [ThroughModel(vm_id=vm_id, tagsmodel_id=tag_id) for vm_id in vm_ids],
+                    ignore_conflicts=True,
+                )
 
                 data = {'status': 'success', 'error_code': 0, 'message': _("Tag Assigned to Objects successfully"), 'data': ''}
-                return JsonResponse(data)
+                return OrjsonResponse(data)
 
             elif action == 'unassign':
                 # Unassign tags from objects
                 tag_name = request.data.get('tag_name')
                 vm_ids = request.data.get('vm_ids', [])
 
-                # Get the tag instance
-                tag = get_object_or_404(TagsModel, tag_name=tag_name)
+                # Get the tag id without loading the whole tag
+                tag_id = get_object_or_404(TagsModel.objects.values_list('tag_id', flat=True), tag_name=tag_name)
 
-                # Remove the tag from the specified VMs
-                tag.vms.remove(*vm_ids)
+                # Remove the tag from the specified VMs with a single delete
+                VM.tags.through.objects.filter(vm_id__in=vm_ids, tagsmodel_id=tag_id).delete()
 
                 data = {'status': 'success', 'error_code': 0, 'message': _("Tag Unassigned from Objects successfully"), 'data': ''}
-                return JsonResponse(data)
+                return OrjsonResponse(data)
 
             else:
                 # Invalid action
                 data = {'status': 'error', 'error_code': 108, 'message': _("Invalid action")}
-                return JsonResponse(data)
+                return OrjsonResponse(data)
 
         except ValidationError as e:
             # Handle ValidationError
             data = {'status': 'error', 'error_code': 103, 'message': "error: {0} ".format(e)}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
         except Exception as e:
             # Handle other exceptions
             data = {'status': 'error', 'error_code': 101, 'message': "error: {0}".format(e)}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
 
 # =====================================================================================================  
@@ -292,45 +445,52 @@ class VMs(APIView):
             queryset = VM.objects.all()
 
             if vm_id:
-
                 # Include details of the specific VM if vm_id is provided
-                vm_instance = get_object_or_404(VM, vm_id=vm_id)
-                vm_data = [{'vm_id':vm_id, 'vm_name': vm_instance.vm_name, 'tags': [{'tag_name': tag.tag_name, 'scope': tag.scope} for tag in vm_instance.tags.all()]}]
+                queryset = queryset.filter(vm_id=vm_id)
 
             else:
-                # if tag_names:
-                #     # Filter VMs by tag names (case-insensitive)
-                #     for tag_name in tag_names:
-                #         queryset = queryset.filter(tags__tag_name__iexact=tag_name)
-
                 if tag_names:
-                    # Construct an OR query for tag_names
-                    or_query = Q()
-                    for tag_name in tag_names:
-                        or_query |= Q(tags__tag_name__iexact=tag_name.strip())
-                    vm_ids = queryset.filter(or_query).values_list('vm_id', flat=True).distinct()
-                    queryset = queryset.filter(vm_id__in=vm_ids)
+                    # Match tag names case-insensitively with a single IN on the lowercased name
+                    queryset = queryset.annotate(tag_name_lower=Lower('tags__tag_name')).filter(
+                        tag_name_lower__in=[tag_name.strip().lower() for tag_name in tag_names]
+                    )
 
                 if scopes:
-                    # Filter VMs by tag scopes (case-insensitive)
+                    # A VM must carry a tag for every scope; each scope is an EXISTS
+                    # subquery on the through table rather than another M2M join
+                    ThroughModel = VM.tags.through
                     for scope in scopes:
-                        queryset = queryset.filter(tags__scope__regex=scope.strip())
-
-
-                # Include information about tags using Prefetch
-                vm_instances = queryset.prefetch_related('tags').all()
-
-                vm_data = [{'vm_id':vm_id, 'vm_name': vm_instance.vm_name, 'tags': [{'tag_name': tag.tag_name, 'scope': tag.scope} for tag in vm_instance.tags.all()]} for vm_instance in vm_instances]
-
-            vm_list_result = [entry for entry in vm_data]
-
-            data = {'status': 'success', 'error_code': 0, 'message': _("VMs retrieved successfully"), 'data': vm_list_result}
-            return JsonResponse(data)
+                        queryset = queryset.filter(Exists(ThroughModel.objects.filter(
+                            vm_id=OuterRef('vm_id'), tagsmodel__scope__icontains=scope.strip()
+                        )))
+
+                if tag_names or scopes:
+                    # Filter through a subquery so the tag join below returns every tag
+                    # of the matching VMs, not only the tags that matched the filters
+                    queryset = VM.objects.filter(vm_id__in=queryset.values('vm_id'))
+
+            # Fetch VMs and their tags as flat rows in one query and group them per VM
+            rows = queryset.values('vm_id', 'vm_name', 'tags__tag_name', 'tags__scope').order_by('vm_id')
+
+            vm_data = []
+            for vm_key, vm_rows in groupby(rows, key=itemgetter('vm_id')):
+                vm_rows = list(vm_rows)
+                vm_data.append({
+                    'vm_id': vm_key,
+                    'vm_name': vm_rows[0]['vm_name'],
+                    'tags': [{'tag_name': row['tags__tag_name'], 'scope': row['tags__scope']} for row in vm_rows if row['tags__tag_name']],
+                })
+
+            if vm_id and not vm_data:
+                raise Http404("No VM matches the given query.")
+
+            data = {'status': 'success', 'error_code': 0, 'message': _("VMs retrieved successfully"), 'data': vm_data}
+            return OrjsonResponse(data)
         
         except Exception as e:
             # Handle any unexpected errors
             data = {'status': 'error', 'error_code': 101, 'message': f"Error: {e}"}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
         
         
 
@@ -344,62 +504,77 @@ class VMs(APIView):
         - tags (optional): List of tag-scope pairs (e.g., tag1:scope1, tag2:scope2) or a single tag-scope pair.
         - user_id: User ID associated with the VM.
 
-        The method checks for the existence of a VM with the same name and creates a new VM instance if it doesn't exist.
+        The method creates a new VM instance, relying on the unique vm_name constraint to reject duplicates.
         It associates the VM with tags provided in the tags parameter or creates new tags.
 
         """
         try:
-            # Validate the form data
-            form = VMForm(request.POST)
-            
-            # Extract parameters from the request
-            vm_name = request.data.get("vm_name")
-            tags = request.data.get("tags")
-            user_id = request.data.get("user_id")
+            # Validate the request data
+            form = VMForm(request.data)
 
-            # Check if VM instance with the same name already exists
-            existing_vm = VM.objects.filter(vm_name=vm_name).exists()
-
-            if existing_vm:
-                data = {'status': 'error', 'error_code': 102, 'message': _("This VM Already exists.")}
-                return JsonResponse(data)
-
-            # Get or create the VM instance
-            vm_instance = VM.objects.create(vm_name=vm_name)
-            
-            # Associate tags with the VM instance
-            if tags:
-                user_profile = get_object_or_404(UserProfile, user_id=user_id)
-
-                # If tags is a single string, convert it to a list for consistency
-                # if ',' in tags:
-                #     tag_scopes = tags.split(',')
-                # else:
-                    # tag_scopes = [tags]
-
-                for tag_scope in tags:
-                    tag_name, scope = tag_scope.split(':')
-                    tag_instance = TagsModel.objects.filter(tag_name=tag_name, scope=scope).first()
+            if not form.is_valid():
+                data = {'status': 'error', 'error_code': 103, 'message': f"Validation Error: {form.errors}"}
+                return OrjsonResponse(data)
 
-                    if tag_instance is None:
-                        tag_instance = TagsModel.objects.create(tag_name=tag_name, scope=scope, user_id=user_profile)
+            # Extract parameters from the validated form and the request
+            vm_name = form.cleaned_data['vm_name']
+            tags = request.data.get("tags")
+            user_id = request.data.get("user_id")
 
-                    vm_instance.tags.add(tag_instance)
+            # Parse all tag-scope pairs before touching the database
+            pairs = [tag_scope.split(':', 1) for tag_scope in tags or []]
+            if not all(len(pair) == 2 and pair[0] for pair in pairs):
+                data = {'status': 'error', 'error_code': 103, 'message': _("Tags must be given as tag_name:scope pairs.")}
+                return OrjsonResponse(data)
+            pairs = [(tag_name, scope or None) for tag_name, scope in pairs]
+
+            # Bulk inserts ignore errors, so values the columns would truncate must be rejected here
+            tag_name_length = TagsModel._meta.get_field('tag_name').max_length
+            scope_length = TagsModel._meta.get_field('scope').max_length
+            if any(len(tag_name) > tag_name_length or len(scope or '') > scope_length for tag_name, scope in pairs):
+                data = {'status': 'error', 'error_code': 103,
+                        'message': _("Tag names and scopes must be at most %(length)d characters.") % {'length': min(tag_name_length, scope_length)}}
+                return OrjsonResponse(data)
+
+            # New tags need an existing owner; bulk inserts ignore FK errors, so check it up front
+            if pairs:
+                user_id, error_response = parse_user_id(user_id)
+                if error_response:
+                    return error_response
+
+                if not UserProfile.objects.filter(pk=user_id).exists():
+                    data = {'status': 'error', 'error_code': 100, 'message': _("User not found")}
+                    return OrjsonResponse(data)
+
+            # Create the VM and link its tags in one transaction so a failure rolls back both
+            with transaction.atomic():
+                # Create the VM instance; a duplicate vm_name fails on the unique constraint
+                try:
+                    vm_instance = VM.objects.create(vm_name=vm_name)
+                except IntegrityError:
+                    # Roll back the failed insert and report the duplicate VM name
+                    transaction.set_rollback(True)
+                    data = {'status': 'error', 'error_code': 102, 'message': _("This VM Already exists.")}
+                    return OrjsonResponse(data)
+
+                # Associate tags with the VM instance
+                if pairs:
+                    # Create any missing tags and link all of them to the VM
+                    link_vm_tags(vm_instance.vm_id, pairs, user_id)
 
             data = {'status': 'success', 'error_code': 0, 'message': _("VM added successfully."), 'data': ''}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
         
         except ValidationError as e:
             # Handle validation error
-            vm_instance.delete()
             data = {'status': 'error', 'error_code': 103, 'message': f"Validation error: {e}"}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
         
         
         except Exception as e:
             # Handle any unexpected errors
             data = {'status': 'error', 'error_code': 101, 'message': f"Error: {e}"}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
 
     def put(self, request):
@@ -435,21 +610,21 @@ class VMs(APIView):
                 updated_vm_instance.save()
 
                 data = {'status': 'success', 'error_code': 0, 'message': _("VM updated successfully"), 'data': ''}
-                return JsonResponse(data)
+                return OrjsonResponse(data)
             else:
                 # Validation error in the form
                 data = {'status': 'error', 'error_code': 103, 'message': f"Validation Error: {form.errors}"}
-                return JsonResponse(data)
+                return OrjsonResponse(data)
 
         except VM.DoesNotExist:
             # VM with the provided ID not found
             data = {'status': 'error', 'error_code': 100, 'message': _("VM not found")}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
         except Exception as e:
             # Handle any unexpected errors
             data = {'status': 'error', 'error_code': 101, 'message': f"Error: {e}"}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
 
     def delete(self, request, vm_id):
@@ -467,27 +642,27 @@ class VMs(APIView):
             vm.delete()
 
             data = {'status': 'success', 'error_code': 0, 'message': _("VM deleted successfully")}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
         except VM.DoesNotExist:
             # VM with the provided ID not found
             data = {'status': 'error', 'error_code': 100, 'message': _("VM not found")}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
         except Exception as e:
             # Handle any unexpected errors
             data = {'status': 'error', 'error_code': 101, 'message': f"Error: {e}"}
-            return JsonResponse(data)
+            return OrjsonResponse(data)
 
 # ==============================================================================
 
 class Users(APIView):
     def get(self, request):
-         # Retrieve all user profiles from the database
-        user_data = UserProfile.objects.all()
+        # Retrieve user_id and user_name for each user without building model instances
+        user_data = UserProfile.objects.values('user_id', 'user_name')
 
-        # Create a list of dictionaries containing user_id and user_name for each user
-        users = [{'user_id': user.user_id, 'user_name': user.user_name} for user in user_data]
+        # Fetch the requested page of users
+        users, pagination = paginate_queryset(request, user_data)
 
         # Return the user data as a JSON response
-        return JsonResponse({'users': users})
\ No newline at end of file
+        return OrjsonResponse({'users': users, 'pagination': pagination})
\ No newline at end of file